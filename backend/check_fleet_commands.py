@@ -0,0 +1,31 @@
+# backend/check_fleet_commands.py
+# 检查批量操作展开出的命令，确保按角色操作时不会影响主机上的另一个角色。
+# 用法: python check_fleet_commands.py   (检查失败时退出码为 1)
+import sys
+
+from fleet_operations import UNINSTALL_COMMANDS, build_commands
+
+print("--- 正在检查批量操作命令 ---")
+failed = False
+
+
+def check(description, condition):
+    global failed
+    print(f"[{'+' if condition else '-'}] {description}")
+    if not condition:
+        failed = True
+
+
+client_uninstall = build_commands('uninstall', 'client')
+check("uninstall client 只移除 client 的服务和配置",
+      all("rathole-server" not in cmd and "server.toml" not in cmd for cmd in client_uninstall)
+      and "rm -f /etc/rathole/client.toml" in client_uninstall)
+check("uninstall client 保留 rathole 二进制和 /etc/rathole",
+      "rm -f /usr/local/bin/rathole" not in client_uninstall
+      and "rm -rf /etc/rathole" not in client_uninstall)
+check("uninstall both 完整卸载", build_commands('uninstall', 'both') == UNINSTALL_COMMANDS)
+check("restart client 只重启 client 服务",
+      build_commands('restart', 'client') == ["systemctl restart rathole-client.service"])
+
+print("\n--- 检查完毕 ---")
+sys.exit(1 if failed else 0)
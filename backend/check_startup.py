@@ -0,0 +1,113 @@
+# backend/check_startup.py
+# 冷启动基准: 在全新的 Python 进程中导入 main.py 并运行 startup 钩子，
+# 针对临时数据库分别测量导入和启动耗时，并列出最慢的模块。
+# 用法: python check_startup.py   (超出预算时退出码为 1，可直接放进 CI)
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# 冷启动预算 (毫秒，导入 + startup 钩子)，可通过环境变量 STARTUP_BUDGET_MS 调整
+BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "1500"))
+RUNS = int(os.environ.get("STARTUP_RUNS", "5"))
+
+# 这些模块只应在真正需要时才加载，不应出现在启动路径上
+LAZY_MODULES = ["paramiko"]
+
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+MEASURE_SNIPPET = f"""
+import asyncio, inspect, json, sys, time
+sys.path.insert(0, {backend_dir!r})
+
+start = time.perf_counter()
+import main
+import_ms = (time.perf_counter() - start) * 1000
+
+async def run_handlers(handlers):
+    for handler in handlers:
+        result = handler()
+        if inspect.isawaitable(result):
+            await result
+
+async def boot():
+    start = time.perf_counter()
+    await run_handlers(main.app.router.on_startup)
+    elapsed = (time.perf_counter() - start) * 1000
+    await run_handlers(main.app.router.on_shutdown)
+    return elapsed
+
+startup_ms = asyncio.run(boot())
+loaded = [m for m in {LAZY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"import_ms": import_ms, "startup_ms": startup_ms, "loaded": loaded}}))
+"""
+
+
+def run_child(args, cwd):
+    """运行子进程；失败时打印它的 stderr 并以非零状态退出，方便在 CI 中排查。"""
+    try:
+        return subprocess.run(args, cwd=cwd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"\n[!] 命令执行失败 (exit {e.returncode}): {' '.join(args[:2])} ...")
+        print(e.stderr)
+        sys.exit(1)
+
+
+def measure_once():
+    # 每次都在新的临时目录里建库，database.py 使用相对路径 ./rathole_manager.db
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_child([sys.executable, os.path.join(backend_dir, "create_db.py")], tmp_dir)
+        output = run_child([sys.executable, "-c", MEASURE_SNIPPET], tmp_dir).stdout.strip().splitlines()[-1]
+    return json.loads(output)
+
+
+def slowest_imports(limit=10):
+    """用 -X importtime 生成启动 profile，返回累计耗时最长的模块。"""
+    stderr = run_child([sys.executable, "-X", "importtime", "-c", "import main"], backend_dir).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # 格式: "import time:  self_us | cumulative_us | module"
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def describe(label, values):
+    print(f"[+] {label}: median {statistics.median(values):.1f} ms, "
+          f"min {min(values):.1f} ms, max {max(values):.1f} ms")
+
+
+print("--- 正在测量后端冷启动时间 ---")
+import_timings, startup_timings, total_timings = [], [], []
+eager = set()
+for _ in range(RUNS):
+    run = measure_once()
+    import_timings.append(run["import_ms"])
+    startup_timings.append(run["startup_ms"])
+    total_timings.append(run["import_ms"] + run["startup_ms"])
+    eager.update(run["loaded"])
+
+median_ms = statistics.median(total_timings)
+print(f"\n({RUNS} runs)")
+describe("import main", import_timings)
+describe("startup hooks", startup_timings)
+describe("total", total_timings)
+
+print("\n[+] 最慢的模块 (累计耗时):")
+for cumulative_us, name in slowest_imports():
+    print(f"- {name}: {cumulative_us / 1000:.1f} ms")
+
+failed = False
+if eager:
+    print(f"\n[-] 错误: 这些模块在启动时就被加载了: {', '.join(sorted(eager))}")
+    failed = True
+if median_ms > BUDGET_MS:
+    print(f"\n[-] 错误: 冷启动 {median_ms:.1f} ms 超出预算 {BUDGET_MS:.0f} ms")
+    failed = True
+
+print("\n--- 检查完毕 ---")
+sys.exit(1 if failed else 0)
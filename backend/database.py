@@ -41,5 +41,18 @@ forwarding_rules = sqlalchemy.Table(
     sqlalchemy.Column("server_id", sqlalchemy.Integer, sqlalchemy.ForeignKey("servers.id")),
 )
 
+
+async def warm_up_database():
+    """
+    在启动时对每张表执行一次轻量查询，
+    让 SQLAlchemy 的编译路径和 SQLite 连接在第一个请求到来前就准备好。
+    """
+    try:
+        for table in metadata.sorted_tables:
+            await database.fetch_one(table.select().limit(1))
+    except Exception as e:
+        # 数据库还没初始化 (没运行 create_db.py) 时不应阻止服务启动
+        print(f"Database warm-up skipped: {e}")
+
 # 使用 create_all 来创建数据库和表 (我们会在一个单独的脚本中调用)
 # metadata.create_all(engine)
\ No newline at end of file
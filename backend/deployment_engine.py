@@ -1,9 +1,9 @@
 # backend/deployment_engine.py
-import paramiko
+import asyncio
 import os
 from jinja2 import Environment, FileSystemLoader
 import secrets
-from security import decrypt_password
+from ssh_client import open_ssh_client
 from io import BytesIO
 import traceback
 
@@ -16,8 +16,17 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 # 将脚本目录和 'templates' 文件夹名拼接成一个绝对路径
 template_dir = os.path.join(script_dir, 'templates')
 # 使用这个绝对路径来初始化 Jinja2 环境
+# 编译后的模板会被缓存，之后只在 .j2 文件被修改时才重新编译
 env = Environment(loader=FileSystemLoader(template_dir))
 
+TEMPLATE_NAMES = ['server.toml.j2', 'client.toml.j2', 'rathole.service.j2']
+
+
+def warm_up_templates():
+    """在启动时预先编译所有模板，放入 Jinja2 的缓存中。"""
+    for name in TEMPLATE_NAMES:
+        env.get_template(name)
+
 def _generate_configs(servers, rules):
     """
     根据服务器和规则数据，生成所有配置文件内容。
@@ -77,16 +86,12 @@ def _generate_configs(servers, rules):
 
 def _deploy_to_host(server_info, configs_to_deploy):
     hostname = server_info['hostname']
-    ssh_user = server_info['ssh_user']
     ssh_port = server_info['ssh_port']
-    password = decrypt_password(server_info['encrypted_password'])
-
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    ssh = None
 
     try:
         print(f"🚀 Connecting to {hostname}:{ssh_port}...")
-        ssh.connect( hostname, port=ssh_port, username=ssh_user, password=password, timeout=10 )
+        ssh = open_ssh_client(server_info, timeout=10)
 
         print(f"🔧 [{hostname}] Setting up environment...")
         install_cmd = f"wget {RATHOLE_DOWNLOAD_URL} -O /tmp/rathole.zip && unzip -o /tmp/rathole.zip -d /tmp && mv /tmp/rathole /usr/local/bin/ && chmod +x /usr/local/bin/rathole"
@@ -154,7 +159,7 @@ async def run_deployment(database):
             if server['id'] in configs and configs[server['id']]:
                 configs_for_this_host = configs[server['id']]
                 print(f"Found {len(configs_for_this_host)} config(s) to deploy for this server.")
-                result = _deploy_to_host(server, configs_for_this_host)
+                result = await asyncio.to_thread(_deploy_to_host, server, configs_for_this_host)
                 results.append(result)
             else:
                 print("No configurations to deploy for this server. Skipping.")
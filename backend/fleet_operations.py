@@ -0,0 +1,141 @@
+# backend/fleet_operations.py
+import asyncio
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ssh_client import open_ssh_client
+
+
+# 卸载 rathole 时需要依次执行的清理命令 (顺序很重要，先停服务再删文件)
+UNINSTALL_COMMANDS = [
+    "systemctl stop rathole-server.service",
+    "systemctl stop rathole-client.service",
+    "systemctl disable rathole-server.service",
+    "systemctl disable rathole-client.service",
+    "rm -f /etc/systemd/system/rathole-server.service",
+    "rm -f /etc/systemd/system/rathole-client.service",
+    "systemctl daemon-reload",
+    "rm -rf /etc/rathole",
+    "rm -f /usr/local/bin/rathole" # 也删除二进制文件
+]
+
+# 忽略 "Failed to stop service... not loaded" 这类无害的错误
+IGNORED_ERRORS = ("not loaded", "No such file or directory")
+
+# 单条命令的最长执行时间 (秒)，比连接超时更长，给 systemctl stop 等慢命令留出时间
+COMMAND_TIMEOUT = 60
+
+
+def _service_names(role):
+    """根据服务器角色返回它上面运行的 rathole systemd 服务名。"""
+    names = []
+    if role in ['server', 'both']:
+        names.append("rathole-server.service")
+    if role in ['client', 'both']:
+        names.append("rathole-client.service")
+    return names
+
+
+def _uninstall_role_commands(role):
+    """只卸载一个角色: 保留 rathole 二进制和 /etc/rathole，供主机上的另一个角色继续使用。"""
+    service_name = f"rathole-{role}.service"
+    return [
+        f"systemctl stop {service_name}",
+        f"systemctl disable {service_name}",
+        f"rm -f /etc/systemd/system/{service_name}",
+        "systemctl daemon-reload",
+        f"rm -f /etc/rathole/{role}.toml",
+    ]
+
+
+def build_commands(action, role):
+    """
+    把一个批量操作 (uninstall / restart / stop) 展开成要在主机上执行的命令列表。
+    restart / stop 只作用于 role 对应的服务；uninstall 在 role 为 'both' 时完整卸载，
+    否则只移除该角色的服务和配置。
+    """
+    if action == 'uninstall':
+        if role == 'both':
+            return list(UNINSTALL_COMMANDS)
+        return _uninstall_role_commands(role)
+    return [f"systemctl {action} {name}" for name in _service_names(role)]
+
+
+def run_commands_on_host(server_info, commands, timeout=10, command_timeout=COMMAND_TIMEOUT):
+    """
+    通过 SSH 在单台主机上依次执行命令 (阻塞调用)。
+    返回非致命错误的列表 (包括单条命令超时)；连接失败等异常直接抛出，由调用方处理。
+    """
+    ssh = open_ssh_client(server_info, timeout)
+    try:
+        all_errors = []
+        for command in commands:
+            print(f"[{server_info['hostname']}] Executing: {command}")
+            # 设置通道超时，避免卡住的主机无限期占用线程
+            stdin, stdout, stderr = ssh.exec_command(command, timeout=command_timeout)
+            try:
+                # 等待命令执行完成，读取错误输出（如果有）
+                error = stderr.read().decode().strip()
+            except socket.timeout:
+                # 记录超时并继续执行剩下的命令，避免主机停留在卸载了一半的状态
+                all_errors.append(f"CMD: `{command}`\nError: timed out after {command_timeout}s")
+                continue
+            if error and not any(ignored in error for ignored in IGNORED_ERRORS):
+                all_errors.append(f"CMD: `{command}`\nError: {error}")
+        return all_errors
+    finally:
+        ssh.close()
+
+
+def _run_on_host(server_info, action, role):
+    """在单台主机上执行批量操作 (阻塞调用)，返回该主机的结果和耗时。"""
+    start = time.perf_counter()
+    result = {
+        "server_id": server_info['id'],
+        "alias": server_info['alias'],
+        "hostname": server_info['hostname'],
+    }
+    try:
+        # 选择器指定了角色时只操作对应的服务，否则按主机自身的角色
+        target_role = role or server_info['role']
+        if action == 'uninstall' and target_role == server_info['role']:
+            # 主机上没有其他角色需要保留，完整卸载
+            target_role = 'both'
+        commands = build_commands(action, target_role)
+        errors = run_commands_on_host(server_info, commands)
+        result.update(status="warning" if errors else "success", errors=errors)
+    except Exception as e:
+        print(f"❌ [{server_info['hostname']}] Bulk {action} failed: {e}")
+        result.update(status="failed", errors=[], error=str(e))
+    result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def run_bulk_operation(servers, action, concurrency, role=None):
+    """
+    在所有选中的主机上并发执行同一个操作，同时连接数不超过 concurrency。
+    返回汇总结果，每台主机的结果都带有耗时。
+    """
+    print(f"Starting bulk {action} on {len(servers)} server(s) (concurrency={concurrency})...")
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    # 使用独立的线程池：并发数不受默认线程池大小限制，也不与其他接口争抢线程
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, _run_on_host, server, action, role) for server in servers)
+        )
+    finally:
+        # 不等待仍在执行的 SSH 任务，避免请求被取消 (例如服务关闭) 时卡住事件循环
+        executor.shutdown(wait=False, cancel_futures=True)
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    failed = sum(1 for r in results if r['status'] == 'failed')
+    print(f"Bulk {action} finished in {duration_ms} ms ({failed} failed).")
+    return {
+        "action": action,
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "duration_ms": duration_ms,
+        "results": results,
+    }
@@ -8,16 +8,20 @@ from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
 from typing_extensions import Literal
+import asyncio
 import sqlalchemy
-import paramiko # <--- 之前遗漏的、关键的 import
 
-from database import database, servers, forwarding_rules
+from database import database, servers, forwarding_rules, warm_up_database
+from deployment_engine import run_deployment, warm_up_templates
 from models import (
     ServerCreate, ServerInfo, 
     RuleCreate, RuleInfo, 
-    ServerStatus, ServerLogs
+    ServerStatus, ServerLogs,
+    BulkOperationRequest, BulkOperationResult
 )
-from security import encrypt_password, decrypt_password
+from security import encrypt_password
+from fleet_operations import UNINSTALL_COMMANDS, run_commands_on_host, run_bulk_operation
+from ssh_client import open_ssh_client
 
 # --- 2. FastAPI App Instance ---
 app = FastAPI(title="Rathole Manager API")
@@ -35,6 +39,9 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup():
     await database.connect()
+    # 提前编译模板和常用查询，避免第一个请求承担这些开销
+    warm_up_templates()
+    await warm_up_database()
 
 @app.on_event("shutdown")
 async def shutdown():
@@ -216,21 +223,10 @@ async def delete_rule(rule_id: int):
 
 # --- Advanced Endpoints ---
 
-@app.get("/api/servers/{server_id}/status", response_model=ServerStatus)
-async def get_server_status(server_id: int):
-    server = await database.fetch_one(servers.select().where(servers.c.id == server_id))
-    if not server:
-        raise HTTPException(status_code=404, detail="Server not found")
-
+def _check_status(server):
     statuses = ServerStatus()
     try:
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            hostname=server.hostname, port=server.ssh_port,
-            username=server.ssh_user, password=decrypt_password(server.encrypted_password),
-            timeout=5
-        )
+        ssh = open_ssh_client(server, timeout=5)
         if server.role in ['server', 'both']:
             stdin, stdout, stderr = ssh.exec_command("systemctl is-active rathole-server.service")
             status = stdout.read().decode().strip()
@@ -246,20 +242,17 @@ async def get_server_status(server_id: int):
         if server.role in ['client', 'both']: statuses.client_status = 'unknown'
     return statuses
 
-@app.get("/api/servers/{server_id}/logs", response_model=ServerLogs)
-async def get_server_logs(server_id: int, service_role: Literal['server', 'client']):
+@app.get("/api/servers/{server_id}/status", response_model=ServerStatus)
+async def get_server_status(server_id: int):
     server = await database.fetch_one(servers.select().where(servers.c.id == server_id))
     if not server:
         raise HTTPException(status_code=404, detail="Server not found")
 
+    return await asyncio.to_thread(_check_status, server)
+
+def _fetch_logs(server, service_role):
     try:
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            hostname=server.hostname, port=server.ssh_port,
-            username=server.ssh_user, password=decrypt_password(server.encrypted_password),
-            timeout=10
-        )
+        ssh = open_ssh_client(server, timeout=10)
         service_name = f"rathole-{service_role}.service"
         command = f"journalctl -u {service_name} -n 50 --no-pager"
         stdin, stdout, stderr = ssh.exec_command(command)
@@ -273,10 +266,17 @@ async def get_server_logs(server_id: int, service_role: Literal['server', 'clien
         print(error_message)
         return ServerLogs(logs=error_message)
 
+@app.get("/api/servers/{server_id}/logs", response_model=ServerLogs)
+async def get_server_logs(server_id: int, service_role: Literal['server', 'client']):
+    server = await database.fetch_one(servers.select().where(servers.c.id == server_id))
+    if not server:
+        raise HTTPException(status_code=404, detail="Server not found")
+
+    return await asyncio.to_thread(_fetch_logs, server, service_role)
+
 @app.post("/api/deploy", status_code=200)
 async def trigger_deployment():
     try:
-        from deployment_engine import run_deployment
         results = await run_deployment(database)
         return {"message": "Deployment process finished.", "results": results}
     except Exception as e:
@@ -291,44 +291,9 @@ async def uninstall_server(server_id: int):
     if not server:
         raise HTTPException(status_code=404, detail="Server not found")
 
-    # 定义要执行的清理命令列表
-    uninstall_commands = [
-        "systemctl stop rathole-server.service",
-        "systemctl stop rathole-client.service",
-        "systemctl disable rathole-server.service",
-        "systemctl disable rathole-client.service",
-        "rm -f /etc/systemd/system/rathole-server.service",
-        "rm -f /etc/systemd/system/rathole-client.service",
-        "systemctl daemon-reload",
-        "rm -rf /etc/rathole",
-        "rm -f /usr/local/bin/rathole" # 也删除二进制文件
-    ]
-    
     try:
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            hostname=server.hostname,
-            port=server.ssh_port,
-            username=server.ssh_user,
-            password=decrypt_password(server.encrypted_password),
-            timeout=10
-        )
-
-        all_errors = []
         print(f"🚀 Starting uninstall process on {server.hostname}...")
-        for command in uninstall_commands:
-            print(f"Executing: {command}")
-            stdin, stdout, stderr = ssh.exec_command(command)
-            # 等待命令执行完成，读取错误输出（如果有）
-            error = stderr.read().decode().strip()
-            if error:
-                # 忽略 "Failed to stop service... not loaded" 这类无害的错误
-                if "not loaded" not in error and "No such file or directory" not in error:
-                    all_errors.append(f"CMD: `{command}`\nError: {error}")
-
-        ssh.close()
-        
+        all_errors = await asyncio.to_thread(run_commands_on_host, dict(server), UNINSTALL_COMMANDS)
         if all_errors:
             # 即使有错误，也认为卸载过程已尝试，返回成功但附带警告
             return {"message": "Uninstall process completed with some warnings.", "errors": all_errors}
@@ -340,3 +305,35 @@ async def uninstall_server(server_id: int):
         print(error_message)
         raise HTTPException(status_code=500, detail=error_message)
 
+@app.post("/api/servers/bulk", response_model=BulkOperationResult, status_code=200)
+async def bulk_server_operation(request: BulkOperationRequest):
+    """
+    在一组服务器上并发执行 uninstall / restart / stop，返回每台主机的结果和耗时.
+    """
+    selector = request.selector
+    if selector.server_ids is None and selector.role is None and selector.rule_server_id is None:
+        raise HTTPException(status_code=400, detail="Selector must specify server_ids, role or rule_server_id.")
+
+    query = servers.select()
+    if selector.server_ids is not None:
+        query = query.where(servers.c.id.in_(selector.server_ids))
+    if selector.role is not None:
+        # 'both' 角色的服务器同时运行 server 和 client
+        roles = [selector.role] if selector.role == 'both' else [selector.role, 'both']
+        query = query.where(servers.c.role.in_(roles))
+    if selector.rule_server_id is not None:
+        client_ids = sqlalchemy.select(forwarding_rules.c.client_id).where(
+            forwarding_rules.c.server_id == selector.rule_server_id
+        )
+        query = query.where(
+            (servers.c.id == selector.rule_server_id) | servers.c.id.in_(client_ids)
+        )
+
+    selected = await database.fetch_all(query)
+    if not selected:
+        raise HTTPException(status_code=404, detail="No servers matched the selector")
+
+    return await run_bulk_operation(
+        [dict(s) for s in selected], request.action,
+        concurrency=request.concurrency, role=selector.role
+    )
@@ -1,18 +1,6 @@
 # backend/models.py
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
-
-# --- 用于密码处理的辅助函数 ---
-from passlib.context import CryptContext
-
-# 创建一个密码上下文，指定加密算法
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
+from typing import List, Literal, Optional
 
 # --- API 数据模型 ---
 
@@ -71,4 +59,38 @@ class ServerStatus(BaseModel):
     
 class ServerLogs(BaseModel):
     logs: str
-    
\ No newline at end of file
+
+
+# --- 批量运维操作模型 ---
+
+# 选择要操作的主机，多个条件同时提供时取交集
+class HostSelector(BaseModel):
+    server_ids: Optional[List[int]] = None
+    role: Optional[Literal['server', 'client', 'both']] = None
+    # 选中该服务端，以及所有有规则指向它的客户端
+    rule_server_id: Optional[int] = None
+
+
+class BulkOperationRequest(BaseModel):
+    action: Literal['uninstall', 'restart', 'stop']
+    selector: HostSelector
+    concurrency: int = Field(5, gt=0, le=50) # 同时连接的主机数量上限
+
+
+class BulkHostResult(BaseModel):
+    server_id: int
+    alias: str
+    hostname: str
+    status: Literal['success', 'warning', 'failed']
+    duration_ms: float
+    errors: List[str] = []
+    error: Optional[str] = None
+
+
+class BulkOperationResult(BaseModel):
+    action: str
+    total: int
+    succeeded: int
+    failed: int
+    duration_ms: float
+    results: List[BulkHostResult]
@@ -0,0 +1,25 @@
+# backend/ssh_client.py
+from security import decrypt_password
+
+
+def open_ssh_client(server_info, timeout=10):
+    """
+    连接到主机并返回 paramiko.SSHClient，由调用方负责 close()。
+    paramiko 导入较慢，只在这里按需加载以加快启动速度；
+    它的调用都是阻塞的，在异步接口中应放到线程池里执行，避免卡住事件循环。
+    """
+    import paramiko
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        ssh.connect(
+            hostname=server_info['hostname'],
+            port=server_info['ssh_port'],
+            username=server_info['ssh_user'],
+            password=decrypt_password(server_info['encrypted_password']),
+            timeout=timeout
+        )
+    except Exception:
+        ssh.close()
+        raise
+    return ssh